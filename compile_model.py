@@ -0,0 +1,25 @@
+# Compile the saved random forest to a native shared library
+#
+# Requires treelite and tl2cgen (pip install treelite tl2cgen) and a C
+# toolchain. Thresholds are quantized to integer bins so the generated tree
+# walk compares small ints instead of doubles. The trained feature names are
+# written next to the library. main.py uses rf_model.so only when tl2cgen is
+# installed, the library is newer than rf_model.joblib and its feature names
+# match; otherwise it falls back to rf_model.joblib. Rerun this after
+# retraining.
+import joblib
+import tl2cgen
+import treelite
+
+# Keep in sync with COMPILED_MODEL_PATH and COMPILED_FEATURES_PATH in main.py
+COMPILED_MODEL_PATH = 'rf_model.so'
+COMPILED_FEATURES_PATH = 'rf_model_features.txt'
+
+if __name__ == '__main__':
+    model = joblib.load('rf_model.joblib')
+    tl_model = treelite.sklearn.import_model(model)
+    tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=COMPILED_MODEL_PATH,
+                       params={'parallel_comp': 32, 'quantize': 1})
+    with open(COMPILED_FEATURES_PATH, 'w') as f:
+        f.write('\n'.join(model.feature_names_in_) + '\n')
+    print(f'Wrote {COMPILED_MODEL_PATH} and {COMPILED_FEATURES_PATH}')
@@ -1,8 +1,148 @@
 # Save model and encoders to files
+import os
 import joblib
+import numpy as np
 import streamlit as st
 from datetime import datetime
 
+try:
+    import tl2cgen
+except ImportError:
+    tl2cgen = None
+
+# Native build of rf_model.joblib and the feature names it was built with,
+# both produced offline by compile_model.py
+COMPILED_MODEL_PATH = 'rf_model.so'
+COMPILED_FEATURES_PATH = 'rf_model_features.txt'
+
+# Column order the model was trained on (its feature_names_in_)
+FEATURE_NAMES = ('distance', 'cab_type', 'surge_multiplier', 'name', 'temp', 'clouds', 'pressure',
+                 'rain', 'humidity', 'wind', 'hour', 'day', 'pickup_hour_counts')
+
+# Reused single-row feature buffer; float32 matches the dtype sklearn trees predict on
+_FEATS = np.empty((1, len(FEATURE_NAMES)), dtype=np.float32)
+
+class _CompiledForest:
+    """Gives a compiled tl2cgen predictor the sklearn predict() interface"""
+
+    def __init__(self, libpath):
+        self._predictor = tl2cgen.Predictor(libpath)
+        if self._predictor.num_feature != len(FEATURE_NAMES):
+            raise ValueError(f"{libpath} expects {self._predictor.num_feature} features, "
+                             f"not {len(FEATURE_NAMES)}")
+
+    def predict(self, X):
+        # The compiled library only accepts input of its own threshold type
+        dmat = tl2cgen.DMatrix(X, dtype=self._predictor.threshold_type)
+        return self._predictor.predict(dmat).ravel()
+
+def _compiled_model_is_current():
+    """Whether rf_model.so was built from the current rf_model.joblib with FEATURE_NAMES"""
+    if tl2cgen is None or not os.path.exists(COMPILED_MODEL_PATH) or not os.path.exists(COMPILED_FEATURES_PATH):
+        return False
+    if os.path.getmtime(COMPILED_MODEL_PATH) < os.path.getmtime('rf_model.joblib'):
+        return False
+    with open(COMPILED_FEATURES_PATH) as f:
+        return tuple(f.read().split()) == FEATURE_NAMES
+
+def _load_model():
+    """Prefer the compiled forest when it is up to date, else the sklearn model"""
+    if _compiled_model_is_current():
+        return _CompiledForest(COMPILED_MODEL_PATH)
+    # rf_model.joblib is an uncompressed dump, so its arrays can be memory-mapped
+    # straight from the OS page cache; keep it uncompressed and on local disk
+    model = joblib.load('rf_model.joblib', mmap_mode='r')
+    if tuple(model.feature_names_in_) != FEATURE_NAMES:
+        raise ValueError(f"rf_model.joblib expects features {list(model.feature_names_in_)}, "
+                         f"not {list(FEATURE_NAMES)}")
+    return model
+
+def _report_missing_file(error):
+    """Show which saved artifact could not be found"""
+    st.error(f"Required file {error.filename} not found. Please ensure all model files are in the correct directory.")
+
+@st.cache_resource
+def _load_artifacts():
+    """
+    Load saved model and encoders once per process
+
+    The encoders are reduced to label -> code dicts so predictions don't go
+    through LabelEncoder.transform, and the model is warmed up with a dummy
+    prediction so its one-time setup happens at startup, not on first click.
+
+    A missing file raises FileNotFoundError, which st.cache_resource does
+    not cache, so restoring the file takes effect on the next rerun.
+
+    Returns:
+        tuple: (model, cab_map, ride_map)
+    """
+    model = _load_model()
+    cab_encoder = joblib.load('cab_type_encoder.joblib')
+    ride_encoder = joblib.load('ride_name_encoder.joblib')
+    cab_map = {c: i for i, c in enumerate(cab_encoder.classes_)}
+    ride_map = {c: i for i, c in enumerate(ride_encoder.classes_)}
+    model.predict(np.zeros_like(_FEATS))
+    return model, cab_map, ride_map
+
+# Sweepable inputs for the sensitivity plot: feature column, low, high
+SWEEPS = {
+    'Trip Distance (mil)': (FEATURE_NAMES.index('distance'), 0.1, 10.0),
+    'Surge Multiplier': (FEATURE_NAMES.index('surge_multiplier'), 1.0, 5.0),
+    'Hour of Day': (FEATURE_NAMES.index('hour'), 0, 24),
+}
+
+def _encode_features(cab_map, ride_map, distance, surge_multiplier, rain, temp, humidity, clouds,
+                     ride_name, cab_type, pickup_hour_counts, hour, day, wind, pressure):
+    """
+    Encode one set of inputs into the shared feature buffer
+    
+    Args:
+        cab_map (dict): Cab type -> code, from _load_artifacts
+        ride_map (dict): Ride name -> code, from _load_artifacts
+        The remaining arguments are as in load_model_and_predict
+        
+    Returns:
+        np.ndarray: The (1, 13) float32 buffer, columns in FEATURE_NAMES order
+    """
+    # Encode categorical variables
+    cab_type_encoded = cab_map[cab_type]
+    ride_name_encoded = ride_map[ride_name]
+    
+    # Fill feature array
+    _FEATS[0, 0] = distance
+    _FEATS[0, 1] = cab_type_encoded
+    _FEATS[0, 2] = surge_multiplier
+    _FEATS[0, 3] = ride_name_encoded
+    _FEATS[0, 4] = temp
+    _FEATS[0, 5] = clouds
+    _FEATS[0, 6] = pressure
+    _FEATS[0, 7] = rain
+    _FEATS[0, 8] = humidity
+    _FEATS[0, 9] = wind
+    _FEATS[0, 10] = hour
+    _FEATS[0, 11] = day
+    _FEATS[0, 12] = pickup_hour_counts
+    return _FEATS
+
+def load_model_and_predict_batch(features):
+    """
+    Make predictions for many rows with a single model call
+    
+    Args:
+        features (np.ndarray): (N, 13) float32 array with columns in
+            FEATURE_NAMES order, cab type and ride name already encoded
+        
+    Returns:
+        np.ndarray: Predicted prices
+    """
+    try:
+        model, _, _ = _load_artifacts()
+    except FileNotFoundError as error:
+        _report_missing_file(error)
+        return None
+    
+    return model.predict(np.ascontiguousarray(features, dtype=np.float32))
+
 def load_model_and_predict(distance, surge_multiplier, rain, temp, humidity, clouds,
                           ride_name, cab_type, pickup_hour_counts, hour, day, wind, pressure):
     """
@@ -26,27 +166,20 @@ def load_model_and_predict(distance, surge_multiplier, rain, temp, humidity, clo
     Returns:
         float: Predicted price
     """
+    # Load model and encoders (cached across reruns)
     try:
-        # Load model and encoders
-        model = joblib.load('rf_model.joblib')
-        cab_encoder = joblib.load('cab_type_encoder.joblib')
-        ride_encoder = joblib.load('ride_name_encoder.joblib')
-        
-        # Encode categorical variables
-        cab_type_encoded = cab_encoder.transform([cab_type])[0]
-        ride_name_encoded = ride_encoder.transform([ride_name])[0]
-        
-        # Create feature array
-        features = [[distance, cab_type_encoded, surge_multiplier, ride_name_encoded, temp, 
-                    clouds, pressure, rain, humidity, wind, pickup_hour_counts, hour, day]]
-        
-        # Make prediction
-        predicted_price = model.predict(features)[0]
-        
-        return predicted_price
-    except FileNotFoundError:
-        st.error("Required model files not found. Please ensure all model files are in the correct directory.")
+        model, cab_map, ride_map = _load_artifacts()
+    except FileNotFoundError as error:
+        _report_missing_file(error)
         return None
+    
+    features = _encode_features(cab_map, ride_map, distance, surge_multiplier, rain, temp, humidity, clouds,
+                                ride_name, cab_type, pickup_hour_counts, hour, day, wind, pressure)
+    
+    # Make prediction
+    predicted_price = model.predict(features)[0]
+    
+    return predicted_price
 
 def calculate_fare(distance, duration, booking_fee, base_fare, waiting_time_rate, distance_rate, minimum_fare,
                   surge_multiplier, rain, temp, humidity, clouds, wind, pressure, pickup_hour_counts,
@@ -70,7 +203,8 @@ def calculate_fare(distance, duration, booking_fee, base_fare, waiting_time_rate
     
     # Add booking fee
     grand_total = trip_fare + booking_fee
-    return round(grand_total, 2)
+    # Left unrounded; the UI formats fares to cents
+    return grand_total
 
 # Streamlit app
 st.title('Cab Ride Price Predictor')
@@ -84,19 +218,23 @@ humidity = st.slider('Humidity (%)', 0, 100, 50)
 clouds = st.slider('Cloud Coverage (%)', 0, 100, 50)
 
 try:
-    ride_encoder = joblib.load('ride_name_encoder.joblib')
-    ride_name = st.selectbox('Ride Type', ride_encoder.classes_)
-except FileNotFoundError:
-    st.error("Ride encoder file not found. Please ensure ride_name_encoder.joblib is in the correct directory.")
+    _, cab_map, ride_map = _load_artifacts()
+    ride_name = st.selectbox('Ride Type', list(ride_map))
+except FileNotFoundError as error:
+    _report_missing_file(error)
     ride_name = None
 
 cab_type = st.selectbox('Cab Type', ['Uber', 'Lyft'])
 wind = st.number_input('Wind Speed (mph)', min_value=0.0, max_value=100.0, value=10.0)
 pressure = st.number_input('Atmospheric Pressure (hPa)', min_value=900.0, max_value=1100.0, value=1013.0)
 
-# Time inputs
-hour = st.number_input('Hour of Day', min_value=0, max_value=24, value=datetime.now().hour)
-day = st.number_input('Day of Month', min_value=1, max_value=31, value=datetime.now().day)
+# Time inputs, defaulting to the time the session started
+if 'init_hour' not in st.session_state:
+    now = datetime.now()
+    st.session_state.init_hour = now.hour
+    st.session_state.init_day = now.day
+hour = st.number_input('Hour of Day', min_value=0, max_value=24, value=st.session_state.init_hour)
+day = st.number_input('Day of Month', min_value=1, max_value=31, value=st.session_state.init_day)
 pickup_hour_counts = st.number_input('Number of Pickups in Hour', min_value=0, max_value=100000, value=50)
 
 if st.button('Predict Price'):
@@ -106,6 +244,23 @@ if st.button('Predict Price'):
         if price is not None:
             st.success(f'Predicted Price: ${price:.2f}')
 
+# Price sensitivity: vary one input with the rest held at the values above
+st.subheader('Price Sensitivity')
+sweep_name = st.selectbox('Vary', list(SWEEPS))
+
+if st.button('Plot Sensitivity'):
+    if ride_name is not None:
+        column, low, high = SWEEPS[sweep_name]
+        values = np.linspace(low, high, 25, dtype=np.float32)
+        features = _encode_features(cab_map, ride_map, distance, surge_multiplier, rain, temp, humidity,
+                                    clouds, ride_name, cab_type, pickup_hour_counts, hour, day, wind, pressure)
+        sweep = np.repeat(features, len(values), axis=0)
+        sweep[:, column] = values
+        prices = load_model_and_predict_batch(sweep)
+        if prices is not None:
+            st.line_chart({sweep_name: values, 'Predicted Price ($)': prices},
+                          x=sweep_name, y='Predicted Price ($)')
+
 # Voo's Current Calculation Section
 st.title("_____________________________")
 st.title("Voo's Current Fare Calculator")